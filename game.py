@@ -1,15 +1,33 @@
+from __future__ import annotations
+
+import atexit
 import random
-import json
+import hashlib
 import os
 import math
-from typing import Dict, List, Tuple, Optional
+import pickle
+import sys
+from collections import deque
+from pathlib import Path
+
+try:
+    import orjson  # fast C-backed JSON, ~3-10x stdlib
+except ImportError:
+    orjson = None
+
+# Single RNG instance: skips the module-attribute hop through random's
+# global instance on every call, and gives one place to seed for
+# reproducible runs (see --seed in main)
+_RNG = random.Random(os.urandom(8))
 
 class HotColdLearner:
     def __init__(self, target_guesses=3):
         self.k = 0.3  # initial hot threshold multiplier
         self.target_guesses = target_guesses
         self.learning_rate = 0.1
-        self.history = []  # (actual_guesses, predicted_guesses) pairs
+        # Bounded ring buffer of recent games; each entry packs
+        # (actual, predicted) as actual * 10000 + predicted
+        self.history = deque(maxlen=128)
         
     def update_k(self, actual_guesses: int, predicted_guesses: int):
         """Update k based on prediction accuracy"""
@@ -23,59 +41,96 @@ class HotColdLearner:
         # Keep k in reasonable bounds
         self.k = max(0.1, min(0.8, self.k))
     
-    def is_hot(self, guess: int, secret: int, cur_lo: int, cur_hi: int) -> bool:
-        """Determine if a guess is 'hot' based on learned threshold"""
+    def is_hot(self, guess: int, secret: int, cur_lo: int, cur_hi: int,
+               threshold: float | None = None) -> bool:
+        """Determine if a guess is 'hot' based on learned threshold
+
+        Callers in a loop can pass a precomputed `threshold` (k * range size)
+        to avoid redoing the multiply per guess.
+        """
         distance = abs(guess - secret)
-        range_size = cur_hi - cur_lo + 1
-        threshold = self.k * range_size
+        if distance == 0:
+            return True  # exact hit; skip the threshold math
+        if threshold is None:
+            range_size = cur_hi - cur_lo + 1
+            if range_size <= 1:
+                return True  # range collapsed: any in-range guess is the secret
+            threshold = self.k * range_size
         return distance < threshold
     
     def record_game(self, actual_guesses: int):
         """Record game outcome for learning"""
         predicted_guesses = self.target_guesses  # Simple prediction for now
-        self.history.append((actual_guesses, predicted_guesses))
+        self.history.append(actual_guesses * 10000 + predicted_guesses)
         self.update_k(actual_guesses, predicted_guesses)
 
+    @staticmethod
+    def unpack_history(entry: int) -> tuple[int, int]:
+        """Decode a packed history entry back to (actual, predicted)"""
+        return divmod(entry, 10000)
+
 class HintBandit:
-    def __init__(self, hint_styles: List[str], exploration_rate=0.1):
+    # A game solved in this many attempts counts as a full reward
+    REWARD_TARGET = 3.0
+
+    # Indices into a per-arm state row
+    ALPHA, BETA, COUNT, AVG = range(4)
+
+    def __init__(self, hint_styles: list[str]):
         self.hint_styles = hint_styles
-        self.exploration_rate = exploration_rate
-        self.attempts = {style: 0 for style in hint_styles}
-        self.avg_attempts = {style: 0.0 for style in hint_styles}
         self.total_games = 0
-        
+        # One row per arm: [ts_alpha, ts_beta, games, avg_attempts].
+        # Single structure instead of four parallel dicts: one allocation,
+        # one hash probe per arm update.
+        self._state = {style: [1.0, 1.0, 0, 0.0] for style in hint_styles}
+
+    def arm_stats(self, style: str) -> tuple[int, float]:
+        """Return (games played, average attempts) for a hint style"""
+        row = self._state[style]
+        return row[self.COUNT], row[self.AVG]
+
     def select_hint_style(self) -> str:
-        """Select hint style using epsilon-greedy strategy"""
-        if random.random() < self.exploration_rate:
-            return random.choice(self.hint_styles)
-        
-        # Exploit: choose style with lowest average attempts
-        best_style = min(self.hint_styles, key=lambda x: self.avg_attempts[x])
+        """Select hint style via Thompson sampling on Beta posteriors"""
+        best_style, best_sample = self.hint_styles[0], -1.0
+        for style, row in self._state.items():
+            sample = _RNG.betavariate(row[self.ALPHA], row[self.BETA])
+            if sample > best_sample:
+                best_style, best_sample = style, sample
         return best_style
-    
+
     def update_stats(self, hint_style: str, attempts: int):
-        """Update statistics for a hint style"""
-        self.attempts[hint_style] += 1
+        """Update statistics and posterior for a hint style"""
+        row = self._state[hint_style]
+        row[self.COUNT] += 1
         self.total_games += 1
-        
+
         # Update running average
-        if self.attempts[hint_style] == 1:
-            self.avg_attempts[hint_style] = attempts
+        if row[self.COUNT] == 1:
+            row[self.AVG] = attempts
         else:
-            self.avg_attempts[hint_style] = 0.8 * self.avg_attempts[hint_style] + 0.2 * attempts
+            row[self.AVG] = 0.8 * row[self.AVG] + 0.2 * attempts
+
+        # Fewer attempts -> reward closer to 1; update the Beta posterior
+        reward = min(1.0, max(0.0, math.exp(-attempts / self.REWARD_TARGET)))
+        row[self.ALPHA] += reward
+        row[self.BETA] += 1.0 - reward
 
 class UserProfile:
     def __init__(self, username: str):
         self.username = username
         self.alpha = 0.5  # user's number picking bias
-        self.avg_attempts = None
+        self.avg_attempts = -1.0  # sentinel: no games recorded yet
         self.range_size = 100
         self.games_played = 0
         self.hot_cold_learner = HotColdLearner()
         self.hint_bandit = HintBandit(['hot_cold', 'higher_lower', 'range'])
-        
+        self._dirty = True  # fresh profiles haven't been written yet
+        self._last_digest = None
+
     def save_to_file(self):
-        """Save user profile to JSON file"""
+        """Save user profile to JSON file (skipped when nothing changed)"""
+        if not self._dirty:
+            return
         data = {
             'username': self.username,
             'alpha': self.alpha,
@@ -85,26 +140,110 @@ class UserProfile:
             'hot_cold_k': self.hot_cold_learner.k,
             'hint_style_stats': {
                 style: {
-                    'attempts': self.hint_bandit.attempts[style],
-                    'avg_attempts': self.hint_bandit.avg_attempts[style]
-                } for style in self.hint_bandit.hint_styles
+                    'attempts': row[HintBandit.COUNT],
+                    'avg_attempts': row[HintBandit.AVG]
+                } for style, row in self.hint_bandit._state.items()
+            },
+            'hint_posteriors': {
+                style: {
+                    'alpha': row[HintBandit.ALPHA],
+                    'beta': row[HintBandit.BETA]
+                } for style, row in self.hint_bandit._state.items()
             }
         }
         
+        # Compact JSON by default; set NUMBERGUESS_PRETTY for readable files
+        pretty = bool(os.environ.get('NUMBERGUESS_PRETTY'))
+        if orjson is not None:
+            payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0)
+        else:
+            import json  # deferred: only needed on the fallback path
+            payload = json.dumps(data, indent=2 if pretty else None).encode()
+
+        # Skip the write when mutations cancelled out and bytes are identical
+        digest = hashlib.blake2b(payload, digest_size=16).digest()
+        if digest == self._last_digest:
+            self._dirty = False
+            return
+
+        # Write to a temp file and rename so a crash never leaves a torn profile
         filename = f"user_{self.username}.json"
-        with open(filename, 'w') as f:
-            json.dump(data, f, indent=2)
+        tmp = filename + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, filename)
+        self._last_digest = digest
+        self._dirty = False
+        self._write_cache(filename)
+
+    # Bump whenever the state layout of UserProfile / HintBandit /
+    # HotColdLearner changes, so pickles from older builds miss instead
+    # of restoring a stale attribute shape under the new classes
+    _CACHE_VERSION = 1
+
+    @classmethod
+    def _cache_key(cls, filename: str) -> str:
+        """Cache validity key for a profile file: changes on any rewrite"""
+        stat = os.stat(filename)
+        return f"v{cls._CACHE_VERSION}-{stat.st_mtime_ns}-{stat.st_size}"
+
+    def _write_cache(self, filename: str):
+        """Refresh the pickle cache so the next start skips JSON parsing"""
+        try:
+            payload = pickle.dumps((self._cache_key(filename), self.__dict__.copy()))
+            cache = f"user_{self.username}.pkl"
+            tmp = cache + '.tmp'
+            Path(tmp).write_bytes(payload)
+            os.replace(tmp, cache)
+        except OSError:
+            pass  # cache is best-effort; the JSON file is the source of truth
+
+    def _load_from_cache(self, filename: str) -> bool:
+        """Restore state from the pickle cache if it matches the JSON file"""
+        cache = f"user_{self.username}.pkl"
+        try:
+            key, state = pickle.loads(Path(cache).read_bytes())
+            if key != self._cache_key(filename):
+                return False
+        except Exception:
+            # Any unpickling failure (missing/corrupt/wrong-shape cache,
+            # classes pickled under a different module name, ...) just
+            # means a miss; the JSON path below is the source of truth
+            return False
+        self.__dict__.update(state)
+        self._dirty = False
+        return True
     
+    def flush(self):
+        """Write pending changes to disk; no-op when the profile is clean
+
+        The dirty flag makes this safe to call liberally: a whole session
+        of games coalesces into a single disk write.
+        """
+        self.save_to_file()
+
     def load_from_file(self):
         """Load user profile from JSON file"""
         filename = f"user_{self.username}.json"
         if os.path.exists(filename):
+            # Warm start: a pickle cache keyed on the JSON file's mtime+size
+            # skips parsing entirely when the profile hasn't changed on disk
+            if self._load_from_cache(filename):
+                print(f"Welcome back, {self.username}! I remember you.")
+                return True
             try:
-                with open(filename, 'r') as f:
-                    data = json.load(f)
+                if orjson is not None:
+                    data = orjson.loads(Path(filename).read_bytes())
+                else:
+                    import json  # deferred: only needed on the fallback path
+                    with open(filename, 'r') as f:
+                        data = json.load(f)
                 
-                self.alpha = data.get('alpha', 0.5)
-                self.avg_attempts = data.get('avg_attempts')
+                self.alpha = min(1.0, max(0.0, data.get('alpha', 0.5)))
+                avg = data.get('avg_attempts')  # older profiles stored null
+                self.avg_attempts = -1.0 if avg is None else float(avg)
                 self.range_size = data.get('range_size', 100)
                 self.games_played = data.get('games_played', 0)
                 
@@ -114,9 +253,19 @@ class UserProfile:
                 if 'hint_style_stats' in data:
                     for style, stats in data['hint_style_stats'].items():
                         if style in self.hint_bandit.hint_styles:
-                            self.hint_bandit.attempts[style] = stats['attempts']
-                            self.hint_bandit.avg_attempts[style] = stats['avg_attempts']
+                            row = self.hint_bandit._state[style]
+                            row[HintBandit.COUNT] = stats['attempts']
+                            row[HintBandit.AVG] = stats['avg_attempts']
+
+                if 'hint_posteriors' in data:
+                    for style, post in data['hint_posteriors'].items():
+                        if style in self.hint_bandit.hint_styles:
+                            row = self.hint_bandit._state[style]
+                            row[HintBandit.ALPHA] = post['alpha']
+                            row[HintBandit.BETA] = post['beta']
                 
+                self._dirty = False  # in-memory state now matches disk
+                self._write_cache(filename)
                 print(f"Welcome back, {self.username}! I remember you.")
                 return True
             except Exception as e:
@@ -127,45 +276,84 @@ class AdaptiveGame:
     def __init__(self, username: str):
         self.user = UserProfile(username)
         self.user.load_from_file()
+        # Crash-safety net: unsaved progress is flushed on interpreter exit
+        atexit.register(self.user.flush)
         
-    def get_hint(self, guess: int, secret: int, cur_lo: int, cur_hi: int, hint_style: str) -> str:
-        """Generate hint based on selected style"""
-        if hint_style == 'hot_cold':
-            if self.user.hot_cold_learner.is_hot(guess, secret, cur_lo, cur_hi):
-                return "🔥 HOT!"
-            else:
-                return "❄️ COLD!"
-        elif hint_style == 'higher_lower':
-            if guess < secret:
-                return "Higher!"
-            else:
-                return "Lower!"
-        elif hint_style == 'range':
-            distance = abs(guess - secret)
+    def _hint_hotcold(self, guess: int, secret: int, cur_lo: int, cur_hi: int,
+                      thresholds: tuple[float, float, float, float]) -> str:
+        if self.user.hot_cold_learner.is_hot(guess, secret, cur_lo, cur_hi,
+                                             threshold=thresholds[3]):
+            return "🔥 HOT!"
+        return "❄️ COLD!"
+
+    def _hint_hl(self, guess: int, secret: int, cur_lo: int, cur_hi: int,
+                 thresholds: tuple[float, float, float, float]) -> str:
+        return "Higher!" if guess < secret else "Lower!"
+
+    def _hint_range(self, guess: int, secret: int, cur_lo: int, cur_hi: int,
+                    thresholds: tuple[float, float, float, float]) -> str:
+        distance = abs(guess - secret)
+        if distance < thresholds[0]:
+            return "🔥 Very close!"
+        elif distance < thresholds[1]:
+            return "🔥 Getting warm!"
+        elif distance < thresholds[2]:
+            return "🌤️ Lukewarm"
+        return "❄️ Far away!"
+
+    # Style-name -> unbound method; the game loop resolves the style once
+    # per game instead of string-comparing on every guess
+    _HINT_DISPATCH = {
+        'hot_cold': _hint_hotcold,
+        'higher_lower': _hint_hl,
+        'range': _hint_range,
+    }
+
+    def get_hint(self, guess: int, secret: int, cur_lo: int, cur_hi: int, hint_style: str,
+                 thresholds: tuple[float, float, float, float] | None = None) -> str:
+        """Generate hint based on selected style
+
+        `thresholds` is an optional (close, warm, lukewarm, hot) tuple of
+        range-size-scaled cutoffs; the game loop precomputes it once per
+        range update instead of per guess.
+        """
+        hint_fn = self._HINT_DISPATCH.get(hint_style)
+        if hint_fn is None:
+            return "Invalid hint style"
+        if thresholds is None:
             range_size = cur_hi - cur_lo + 1
-            if distance < range_size * 0.1:
-                return "🔥 Very close!"
-            elif distance < range_size * 0.3:
-                return "🔥 Getting warm!"
-            elif distance < range_size * 0.5:
-                return "🌤️ Lukewarm"
-            else:
-                return "❄️ Far away!"
-        return "Invalid hint style"
+            thresholds = (range_size * 0.1, range_size * 0.3, range_size * 0.5,
+                          self.user.hot_cold_learner.k * range_size)
+        return hint_fn(self, guess, secret, cur_lo, cur_hi, thresholds)
     
     def play_user_guesses(self):
         """User guesses the computer's number"""
-        lo, hi = 1, self.user.range_size
-        secret = random.randint(lo, hi)
+        # Bind hot-loop attributes to locals: LOAD_FAST vs repeated LOAD_ATTR
+        user = self.user
+        learner = user.hot_cold_learner
+        bandit = user.hint_bandit
+
+        lo, hi = 1, user.range_size
+        secret = _RNG.randint(lo, hi)
         attempts = 0
         cur_lo, cur_hi = lo, hi
-        
+
         print(f"\n🎯 I'm thinking of a number between {lo} and {hi}.")
-        print(f"💡 Based on your profile, I think you'll pick numbers around position {self.user.alpha:.2f}")
-        
-        hint_style = self.user.hint_bandit.select_hint_style()
+        print(f"💡 Based on your profile, I think you'll pick numbers around position {user.alpha:.2f}")
+
+        hint_style = bandit.select_hint_style()
+        hint_fn = self._HINT_DISPATCH[hint_style]  # specialize once per game
         print(f"🎲 Using hint style: {hint_style}")
-        
+
+        # Range-scaled hint cutoffs, recomputed only when the range shrinks
+        k = learner.k
+
+        def _thresholds():
+            rs = cur_hi - cur_lo + 1
+            return (rs * 0.1, rs * 0.3, rs * 0.5, k * rs)
+
+        thresholds = _thresholds()
+
         while True:
             try:
                 guess = int(input(f"Your guess [{cur_lo}-{cur_hi}]: "))
@@ -182,23 +370,28 @@ class AdaptiveGame:
             # Update user's alpha based on their guess position
             if cur_hi > cur_lo:
                 pos = (guess - cur_lo) / (cur_hi - cur_lo)
-                self.user.alpha = 0.9 * self.user.alpha + 0.1 * pos
-            
-            hint = self.get_hint(guess, secret, cur_lo, cur_hi, hint_style)
+                # Clamp so alpha stays in [0, 1]; play_computer_guesses relies on it
+                user.alpha = min(1.0, max(0.0, 0.9 * user.alpha + 0.1 * pos))
+                user._dirty = True
+
+            hint = hint_fn(self, guess, secret, cur_lo, cur_hi, thresholds)
             print(f"💡 {hint}")
-            
+
             if guess == secret:
                 print(f"🎉 Bang! You got it in {attempts} attempts!")
-                self.user.hot_cold_learner.record_game(attempts)
-                self.user.hint_bandit.update_stats(hint_style, attempts)
+                learner.record_game(attempts)
+                bandit.update_stats(hint_style, attempts)
                 self.update_user_stats(attempts)
+                user._dirty = True
                 break
             elif guess < secret:
                 print("Higher.")
                 cur_lo = max(cur_lo, guess + 1)
+                thresholds = _thresholds()
             else:
                 print("Lower.")
                 cur_hi = min(cur_hi, guess - 1)
+                thresholds = _thresholds()
     
     def play_computer_guesses(self):
         """Computer guesses the user's number using learned alpha"""
@@ -206,21 +399,25 @@ class AdaptiveGame:
         attempts = 0
         cur_lo, cur_hi = lo, hi
         
+        # alpha doesn't change during this mode; bind it once
+        alpha = self.user.alpha
+
         print(f"\n🤔 Think of a number between {lo} and {hi}.")
-        print(f"🧠 I'll try to read your mind using my learned alpha: {self.user.alpha:.2f}")
+        print(f"🧠 I'll try to read your mind using my learned alpha: {alpha:.2f}")
         input("Press Enter when you're ready...")
-        
+
         while True:
-            # Use alpha to bias guess toward user's preferred position
+            # Bias the guess toward the user's preferred position, but decay
+            # the bias toward 0.5 each attempt so later guesses revert to
+            # binary search: worst case ceil(log2(N)) instead of O(N) when
+            # alpha sits near 0 or 1. alpha is clamped to [0, 1] at update
+            # time, so the result is always within [cur_lo, cur_hi].
             if cur_hi > cur_lo:
-                bias_pos = cur_lo + (cur_hi - cur_lo) * self.user.alpha
-                guess = round(bias_pos)
+                eff_alpha = 0.5 + (alpha - 0.5) * (0.6 ** attempts)
+                guess = cur_lo + int((cur_hi - cur_lo) * eff_alpha + 0.5)
             else:
                 guess = cur_lo
-            
-            # Ensure guess is in valid range
-            guess = max(cur_lo, min(cur_hi, guess))
-            
+
             attempts += 1
             print(f"🤖 My guess #{attempts}: {guess}")
             
@@ -249,11 +446,9 @@ class AdaptiveGame:
     
     def update_user_stats(self, attempts: int):
         """Update user statistics after a game"""
-        if self.user.avg_attempts is None:
-            self.user.avg_attempts = attempts
-        else:
-            self.user.avg_attempts = 0.8 * self.user.avg_attempts + 0.2 * attempts
-        
+        a = self.user.avg_attempts
+        self.user.avg_attempts = attempts if a < 0 else a + 0.2 * (attempts - a)
+
         self.user.games_played += 1
         
         # Adjust range size based on performance
@@ -261,56 +456,76 @@ class AdaptiveGame:
             self.user.range_size = min(10000, int(self.user.range_size * 1.2))
         elif self.user.avg_attempts > 8:
             self.user.range_size = max(10, int(self.user.range_size * 0.8))
+
+        self.user._dirty = True
     
     def show_stats(self):
         """Display current user statistics"""
-        print(f"\n📊 {self.user.username}'s Stats:")
-        print(f"   Games played: {self.user.games_played}")
-        print(f"   Average attempts: {self.user.avg_attempts:.1f}" if self.user.avg_attempts else "   Average attempts: N/A")
-        print(f"   Current range size: {self.user.range_size}")
-        print(f"   Alpha (number bias): {self.user.alpha:.3f}")
-        print(f"   Hot/Cold threshold (k): {self.user.hot_cold_learner.k:.3f}")
-        print(f"   Hint style performance:")
+        lines = [
+            f"\n📊 {self.user.username}'s Stats:",
+            f"   Games played: {self.user.games_played}",
+            f"   Average attempts: {self.user.avg_attempts:.1f}" if self.user.avg_attempts >= 0 else "   Average attempts: N/A",
+            f"   Current range size: {self.user.range_size}",
+            f"   Alpha (number bias): {self.user.alpha:.3f}",
+            f"   Hot/Cold threshold (k): {self.user.hot_cold_learner.k:.3f}",
+            "   Hint style performance:",
+        ]
         for style in self.user.hint_bandit.hint_styles:
-            avg = self.user.hint_bandit.avg_attempts[style]
-            count = self.user.hint_bandit.attempts[style]
+            count, avg = self.user.hint_bandit.arm_stats(style)
             if count > 0:
-                print(f"     {style}: {avg:.1f} attempts ({count} games)")
+                lines.append(f"     {style}: {avg:.1f} attempts ({count} games)")
+        # One write instead of a print/syscall per line
+        sys.stdout.write('\n'.join(lines) + '\n')
     
     def save_profile(self):
         """Save user profile"""
-        self.user.save_to_file()
+        self.user.flush()
         print(f"💾 Profile saved for {self.user.username}")
 
+_MENU = """
+🎯 Game Modes:
+1. You guess my number (with adaptive hints)
+2. I guess your number (I learn your patterns)
+3. Show my stats
+4. Save profile
+5. Quit"""
+
 def main():
+    # --seed N makes a run reproducible (useful for self-play/debugging)
+    if '--seed' in sys.argv:
+        try:
+            _RNG.seed(int(sys.argv[sys.argv.index('--seed') + 1]))
+        except (IndexError, ValueError):
+            print("Usage: --seed <integer>")
+            return
+
     print("🎮 Adaptive Number Guessing Game")
     print("=" * 40)
     
     username = input("Enter your username: ").strip() or "Player"
     game = AdaptiveGame(username)
-    
+
+    # Jump table: one dict lookup per choice instead of chained compares,
+    # and adding a mode is a one-line change
+    actions = {
+        '1': game.play_user_guesses,
+        '2': game.play_computer_guesses,
+        '3': game.show_stats,
+        '4': game.save_profile,
+    }
+
     while True:
-        print(f"\n🎯 Game Modes:")
-        print("1. You guess my number (with adaptive hints)")
-        print("2. I guess your number (I learn your patterns)")
-        print("3. Show my stats")
-        print("4. Save profile")
-        print("5. Quit")
-        
+        print(_MENU)
+
         try:
             choice = input(f"\n{username}, what would you like to do? (1-5): ").strip()
         except (EOFError, KeyboardInterrupt):
             print("\nGoodbye!")
             break
-        
-        if choice == '1':
-            game.play_user_guesses()
-        elif choice == '2':
-            game.play_computer_guesses()
-        elif choice == '3':
-            game.show_stats()
-        elif choice == '4':
-            game.save_profile()
+
+        action = actions.get(choice)
+        if action is not None:
+            action()
         elif choice == '5':
             game.save_profile()
             print("👋 Thanks for playing! Your profile has been saved.")
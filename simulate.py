@@ -0,0 +1,109 @@
+"""Offline self-play simulation for tuning HotColdLearner.k.
+
+The interactive loops in game.py are fine for humans but too slow to
+grid-search parameters over thousands of games. The numeric core of a
+game (range narrowing, alpha-biased guessing, hot/cold reaction) is
+lifted here into plain scalar int/float code that numba can JIT to
+native speed. Without numba everything still runs, just slower.
+"""
+
+try:
+    from numba import njit, prange
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda f: f
+
+
+@njit(cache=True)
+def simulate_game(secret: int, range_size: int, k: float, alpha: float, seed: int) -> int:
+    """Play one synthetic game and return the attempt count.
+
+    The simulated player guesses at the alpha position of the current
+    range, nudged by a small deterministic jitter, and tightens toward
+    its last guess when the hot/cold hint (controlled by k) fires.
+    """
+    cur_lo, cur_hi = 1, range_size
+    state = seed * 6364136223846793005 + 1442695040888963407  # LCG
+    attempts = 0
+    last_guess = -1
+
+    while attempts < 10000:
+        span = cur_hi - cur_lo
+        if span <= 0:
+            guess = cur_lo
+        else:
+            state = (state * 6364136223846793005 + 1442695040888963407) & 0xFFFFFFFFFFFFFFFF
+            jitter = ((state >> 33) % 2001 - 1000) / 10000.0  # in [-0.1, 0.1]
+            pos = alpha + jitter
+            if pos < 0.0:
+                pos = 0.0
+            elif pos > 1.0:
+                pos = 1.0
+            guess = cur_lo + int(span * pos + 0.5)
+
+        attempts += 1
+        if guess == secret:
+            return attempts
+
+        distance = secret - guess
+        if distance < 0:
+            distance = -distance
+        hot = distance < k * (cur_hi - cur_lo + 1)
+
+        if guess < secret:
+            cur_lo = guess + 1
+        else:
+            cur_hi = guess - 1
+
+        # A hot hint makes the player search near the last guess:
+        # shrink the far side of the range toward the guess.
+        if hot and last_guess >= 0:
+            if guess < secret and cur_hi - guess > 2 * distance:
+                cur_hi = guess + 2 * distance
+            elif guess > secret and guess - cur_lo > 2 * distance:
+                cur_lo = guess - 2 * distance
+        last_guess = guess
+
+    return attempts
+
+
+@njit(parallel=True, cache=True)
+def _avg_attempts_for_k(k: float, range_size: int, alpha: float, n_games: int) -> float:
+    total = 0
+    for seed in prange(n_games):
+        state = (seed * 2654435761 + 1) & 0xFFFFFFFFFFFFFFFF
+        secret = 1 + (state >> 16) % range_size
+        total += simulate_game(secret, range_size, k, alpha, seed + 1)
+    return total / n_games
+
+
+def tune_k(range_size: int = 100, alpha: float = 0.5, n_games: int = 10000,
+           k_values=None) -> float:
+    """Grid-search k over self-play games and return the best value.
+
+    The result is a good initializer for HotColdLearner.k before any
+    real games have been recorded.
+    """
+    if k_values is None:
+        k_values = [0.1 + 0.05 * i for i in range(15)]  # 0.10 .. 0.80
+
+    best_k, best_avg = k_values[0], float('inf')
+    for k in k_values:
+        avg = _avg_attempts_for_k(k, range_size, alpha, n_games)
+        if avg < best_avg:
+            best_k, best_avg = k, avg
+    return best_k
+
+
+if __name__ == "__main__":
+    import sys
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    k = tune_k(n_games=n)
+    print(f"Best initial k over {n} self-play games: {k:.2f}"
+          + ("" if HAVE_NUMBA else " (numba not installed; ran interpreted)"))